@@ -6,17 +6,23 @@ and prints today's events on a thermal printer.
 
 I wrote this while learning Python 😅
 So comments are very detailed and simple.
+
+The Google login, fetching and printer helpers
+are shared with the other scripts (see calprinter/core.py).
 """
 
-import os
 import datetime
-import serial
 
-# Google API imports
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from calprinter.core import (
+    authenticate_google,
+    get_todays_events,
+    connect_to_printer,
+    buf_text,
+    buf_line,
+    buf_feed,
+    write_page,
+    format_event,
+)
 
 
 # ============================================================
@@ -32,86 +38,15 @@ PRINTER_BAUDRATE = 9600
 # Google Calendar read-only permission
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 
+# Printed at the top of every page (built once)
+_HEADER_BYTES = b"DAILY SCHEDULE\n"
 
-# ============================================================
-# GOOGLE CALENDAR LOGIN PART
-# ============================================================
-
-def google_login():
-    """
-    This function logs into Google Calendar.
-
-    First run:
-    - Opens browser
-    - Asks Google login
-    - Creates token.json
-
-    Next runs:
-    - Uses token.json automatically
-    """
-    creds = None
-
-    # Check if token file already exists
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-
-    # If token not valid, login again
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            print("Refreshing Google login...")
-            creds.refresh(Request())
-        else:
-            print("Opening browser for Google login...")
-            flow = InstalledAppFlow.from_client_secrets_file(
-                "credentials.json", SCOPES
-            )
-            creds = flow.run_local_server(port=0)
-
-        # Save token so we don't login every time
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
-
-        print("Google login successful!")
-
-    return creds
-
-
-# ============================================================
-# GET TODAY'S CALENDAR EVENTS
-# ============================================================
 
-def get_today_events():
+def event_text(event):
     """
-    Gets all today's events from Google Calendar
+    Converts event into printable text
     """
-    creds = google_login()
-
-    service = build("calendar", "v3", credentials=creds)
-
-    now = datetime.datetime.now()
-
-    # Start and end of today
-    start_day = datetime.datetime.combine(now.date(), datetime.time.min)
-    end_day = datetime.datetime.combine(now.date(), datetime.time.max)
-
-    # Google needs ISO format
-    time_min = start_day.isoformat() + "Z"
-    time_max = end_day.isoformat() + "Z"
-
-    print("Fetching today's events...")
-
-    events_result = service.events().list(
-        calendarId="primary",
-        timeMin=time_min,
-        timeMax=time_max,
-        singleEvents=True,
-        orderBy="startTime"
-    ).execute()
-
-    events = events_result.get("items", [])
-
-    print(f"Found {len(events)} event(s)")
-    return events
+    return format_event(event, all_day="ALL DAY", untitled="No Title")
 
 
 # ============================================================
@@ -120,15 +55,12 @@ def get_today_events():
 
 def connect_printer():
     """
-    Connects to thermal printer using serial
+    Connects to thermal printer using serial.
+    Returns None if it doesn't work.
     """
     try:
         print("Connecting to printer...")
-        printer = serial.Serial(
-            port=PRINTER_PORT,
-            baudrate=PRINTER_BAUDRATE,
-            timeout=1
-        )
+        printer = connect_to_printer(PRINTER_PORT, PRINTER_BAUDRATE)
         print("Printer connected!")
         return printer
 
@@ -138,52 +70,6 @@ def connect_printer():
         return None
 
 
-def printer_write(printer, text):
-    """
-    Sends text to printer
-    """
-    if printer:
-        printer.write(text.encode("utf-8"))
-
-
-def printer_line(printer):
-    """
-    Prints a separator line
-    """
-    printer_write(printer, "-" * 32 + "\n")
-
-
-def printer_feed(printer, lines=3):
-    """
-    Feeds paper
-    """
-    if printer:
-        printer.write(b"\n" * lines)
-
-
-# ============================================================
-# FORMAT EVENTS FOR PRINTING
-# ============================================================
-
-def format_event(event):
-    """
-    Converts event into printable text
-    """
-    title = event.get("summary", "No Title")
-
-    start = event["start"].get("dateTime", event["start"].get("date"))
-
-    # If event has time
-    if "T" in start:
-        dt = datetime.datetime.fromisoformat(start.replace("Z", "+00:00"))
-        time_str = dt.strftime("%I:%M %p")
-    else:
-        time_str = "ALL DAY"
-
-    text = f"{time_str} - {title}\n"
-    return text
-
-
 # ============================================================
 # PRINT FULL DAY
 # ============================================================
@@ -192,24 +78,28 @@ def print_schedule(printer, events):
     """
     Prints everything nicely
     """
-    printer_feed(printer, 1)
-    printer_write(printer, "DAILY SCHEDULE\n")
-    printer_line(printer)
+    buf = []  # Everything to print goes in here first
+
+    buf_feed(buf, 1)
+    buf.append(_HEADER_BYTES)
+    buf_line(buf)
 
     today = datetime.datetime.now().strftime("%A %d %B %Y")
-    printer_write(printer, today + "\n")
-    printer_line(printer)
+    buf_text(buf, today + "\n")
+    buf_line(buf)
 
     if events:
         for i, event in enumerate(events, 1):
-            printer_write(printer, f"{i}. ")
-            printer_write(printer, format_event(event))
+            buf_text(buf, f"{i}. {event_text(event)}")
     else:
-        printer_write(printer, "No events today 🎉\n")
+        buf_text(buf, "No events today 🎉\n")
+
+    buf_line(buf)
+    buf_text(buf, f"Total events: {len(events)}\n")
+    buf_feed(buf, 5)
 
-    printer_line(printer)
-    printer_write(printer, f"Total events: {len(events)}\n")
-    printer_feed(printer, 5)
+    # Send everything in one go
+    write_page(printer, buf)
 
     print("Printed successfully!")
 
@@ -221,17 +111,26 @@ def print_schedule(printer, events):
 def main():
     print("\n--- Calendar Printer Started ---\n")
 
-    events = get_today_events()
+    print("Fetching today's events...")
+    events = get_todays_events(authenticate_google(SCOPES))
+    print(f"Found {len(events)} event(s)")
+
     printer = connect_printer()
 
     if printer:
-        print_schedule(printer, events)
-        printer.close()
-        print("Printer closed.")
+        try:
+            print_schedule(printer, events)
+        except Exception as e:
+            print("Printing failed 😢")
+            print(e)
+        finally:
+            # Always give the COM port back
+            printer.close()
+            print("Printer closed.")
     else:
         print("\nPrinter not connected. Showing events here:\n")
         for e in events:
-            print(format_event(e))
+            print(event_text(e))
 
     print("\n--- Program Finished ---\n")
 
@@ -17,21 +17,47 @@ So the code is very verbose and heavily commented.
 # IMPORTS (things Python needs)
 # ------------------------------------------------
 
-import os                 # Used to check if files exist
 import datetime           # Used for dates and time
-import serial             # Used to talk to thermal printer
+import asyncio            # Used to download from Google in parallel
 import tkinter as tk      # Main GUI library
 from tkinter import ttk, messagebox, scrolledtext  # GUI widgets
 import threading          # Used so printing doesn't freeze GUI
-import schedule           # Used for automatic time scheduling
-import time               # Used for sleep in scheduler
-import json               # Used to save settings to file
+import atexit             # Used to close the printer when the program ends
 
-# Google API imports
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+# Google login, downloading, printer and format helpers
+# (shared with the other scripts, see calprinter/core.py)
+from calprinter.core import (
+    authenticate_google,
+    fetch_all,
+    get_todays_tasks,
+    connect_to_printer,
+    buf_text,
+    buf_line,
+    buf_feed,
+    write_page,
+    format_event,
+    format_task,
+)
+
+# Used to save settings to file.
+# orjson is a lot faster, but it's optional - fall back to normal json
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    import json
+
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
 
 
 # ------------------------------------------------
@@ -42,15 +68,12 @@ from googleapiclient.discovery import build
 PRINTER_PORT = 'COM4'
 PRINTER_BAUDRATE = 9600
 
-# Google permissions
-SCOPES = [
-    'https://www.googleapis.com/auth/calendar.readonly',
-    'https://www.googleapis.com/auth/tasks.readonly'
-]
-
 # File where settings are saved
 CONFIG_FILE = 'printer_config.json'
 
+# Longest time the scheduler sleeps before looking at the clock again
+SCHEDULER_STEP_SECONDS = 60
+
 
 # ------------------------------------------------
 # LOAD AND SAVE CONFIG FILE
@@ -71,260 +94,119 @@ def load_config():
         'auto_start': False
     }
 
-    # If config file exists, try to read it
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
+    # Try to read the config file
+    try:
+        with open(CONFIG_FILE, 'rb') as f:
+            config = _json_loads(f.read())
 
-            # Make sure all keys exist
-            for key in default_config:
-                if key not in config:
-                    config[key] = default_config[key]
+    except Exception:
+        # If file is missing or broken, return defaults
+        return default_config
 
-            return config
+    # Valid JSON but not settings (e.g. [] or null)
+    if not isinstance(config, dict):
+        return default_config
 
-        except Exception:
-            # If file is broken, return defaults
-            return default_config
+    # Make sure all keys exist
+    for key in default_config:
+        if key not in config:
+            config[key] = default_config[key]
 
-    # If file does not exist
-    return default_config
+    return config
 
 
 def save_config(config):
     """
     Saves configuration to JSON file
     """
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    with open(CONFIG_FILE, 'wb') as f:
+        f.write(_json_dumps(config))
 
 
 # ------------------------------------------------
-# GOOGLE AUTHENTICATION
-# ------------------------------------------------
-
-def authenticate_google():
-    """
-    Handles Google login for Calendar and Tasks.
-    """
-
-    creds = None
-
-    # Load token if it exists
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-
-    # If token missing or invalid
-    if not creds or not creds.valid:
-
-        # Refresh expired token
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-
-        # First time login
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json',
-                SCOPES
-            )
-            creds = flow.run_local_server(port=0)
-
-        # Save token
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-
-    return creds
-
-
-# ------------------------------------------------
-# FETCH GOOGLE CALENDAR EVENTS
+# PRINT FULL SCHEDULE
 # ------------------------------------------------
 
-def get_todays_events():
-    """
-    Fetches today's calendar events
-    """
-
-    creds = authenticate_google()
-    service = build('calendar', 'v3', credentials=creds)
+# Printer bytes that never change, built once when the program starts
+_HEADER_BYTES = b"DAILY SCHEDULE\n"
+_EVENTS_TITLE = b"\nEVENTS:\n"
+_TASKS_TITLE = b"\nTASKS:\n"
 
-    now = datetime.datetime.now()
 
-    start_day = datetime.datetime.combine(now.date(), datetime.time.min)
-    end_day = datetime.datetime.combine(now.date(), datetime.time.max)
-
-    time_min = start_day.isoformat() + 'Z'
-    time_max = end_day.isoformat() + 'Z'
-
-    events_result = service.events().list(
-        calendarId='primary',
-        timeMin=time_min,
-        timeMax=time_max,
-        singleEvents=True,
-        orderBy='startTime'
-    ).execute()
-
-    return events_result.get('items', [])
-
-
-# ------------------------------------------------
-# FETCH GOOGLE TASKS
-# ------------------------------------------------
-
-def get_todays_tasks():
+def print_schedule(printer, events, tasks, priorities):
     """
-    Fetches incomplete Google Tasks
+    Prints events and tasks.
+    The printer stays open so the next print can reuse it.
     """
 
-    creds = authenticate_google()
-    service = build('tasks', 'v1', credentials=creds)
-
-    all_tasks = []
-
     try:
-        task_lists = service.tasklists().list().execute()
-        lists = task_lists.get('items', [])
-
-        for task_list in lists:
-            list_id = task_list['id']
-            list_name = task_list['title']
-
-            tasks_result = service.tasks().list(
-                tasklist=list_id,
-                showCompleted=False,
-                showHidden=False
-            ).execute()
-
-            tasks = tasks_result.get('items', [])
-
-            for task in tasks:
-                task['list_name'] = list_name
-                all_tasks.append(task)
+        buf = []
 
-    except Exception as e:
-        print("Error loading tasks:", e)
-
-    return all_tasks
+        buf_feed(buf)
+        buf.append(_HEADER_BYTES)
+        buf_line(buf)
 
+        today = datetime.datetime.now().strftime('%A %b %d %Y')
+        buf_text(buf, today + "\n")
+        buf_line(buf)
 
-# ------------------------------------------------
-# PRINTER HELPERS
-# ------------------------------------------------
+        buf.append(_EVENTS_TITLE)
+        buf_line(buf)
 
-def connect_to_printer(port, baudrate):
-    """
-    Connects to the thermal printer
-    """
-    try:
-        return serial.Serial(port=port, baudrate=baudrate, timeout=1)
-    except Exception as e:
-        raise Exception(f"Printer connection failed: {e}")
+        for event in events:
+            buf_text(buf, format_event(event))
 
+        buf.append(_TASKS_TITLE)
+        buf_line(buf)
 
-def print_text(printer, text):
-    """
-    Sends text to printer
-    """
-    if printer:
-        printer.write(text.encode('utf-8', errors='ignore'))
+        for task in tasks:
+            priority = priorities.get(task.get('id', ''), 'Normal')
+            buf_text(buf, format_task(task, priority))
 
+        buf_feed(buf, 5)
 
-def print_line(printer):
-    """
-    Prints a separator line
-    """
-    print_text(printer, "-" * 32 + "\n")
+        # Send the whole page in one write
+        write_page(printer, buf)
 
+        return True, "Printed successfully"
 
-def print_feed(printer, lines=3):
-    """
-    Feeds paper
-    """
-    if printer:
-        printer.write(b"\n" * lines)
+    except Exception as e:
+        return False, str(e)
 
 
 # ------------------------------------------------
-# FORMAT FUNCTIONS
+# SCHEDULER TIME MATH
 # ------------------------------------------------
 
-def format_event(event):
-    """
-    Formats calendar event text
+def next_print_time(schedules, now=None, last_fired=None):
     """
-    title = event.get('summary', 'Untitled Event')
-    start = event['start'].get('dateTime', event['start'].get('date'))
-
-    if 'T' in start:
-        dt = datetime.datetime.fromisoformat(start.replace('Z', '+00:00'))
-        time_str = dt.strftime('%I:%M %p')
-    else:
-        time_str = 'All Day'
-
-    return f"{time_str} - {title}\n"
+    Finds the next time we should print.
 
-
-def format_task(task, priority='Normal'):
-    """
-    Formats task text
+    schedules is a list like ['08:00', '12:00', '18:00'].
+    If a time already passed today, tomorrow's one is used.
+    last_fired is the time we printed last, so the same time
+    is never printed twice (e.g. when the clock goes back an hour).
+    Returns None if there are no valid times.
     """
-    title = task.get('title', 'Untitled Task')
-    list_name = task.get('list_name', 'Tasks')
-
-    marker = '!!!' if priority == 'High' else ''
-
-    text = f"[ ] {marker} {title}\n"
-
-    if list_name != 'My Tasks':
-        text += f"    List: {list_name}\n"
 
-    return text
+    if now is None:
+        now = datetime.datetime.now()
 
+    upcoming = []
 
-# ------------------------------------------------
-# PRINT FULL SCHEDULE
-# ------------------------------------------------
-
-def print_schedule(config, events, tasks, priorities):
-    """
-    Prints events and tasks
-    """
-
-    try:
-        printer = connect_to_printer(
-            config['printer_port'],
-            config['printer_baudrate']
-        )
-
-        print_feed(printer)
-        print_text(printer, "DAILY SCHEDULE\n")
-        print_line(printer)
-
-        today = datetime.datetime.now().strftime('%A %b %d %Y')
-        print_text(printer, today + "\n")
-        print_line(printer)
-
-        print_text(printer, "\nEVENTS:\n")
-        print_line(printer)
-
-        for event in events:
-            print_text(printer, format_event(event))
-
-        print_text(printer, "\nTASKS:\n")
-        print_line(printer)
-
-        for task in tasks:
-            priority = priorities.get(task.get('id', ''), 'Normal')
-            print_text(printer, format_task(task, priority))
+    for t in schedules:
+        try:
+            hour, minute = (int(part) for part in t.split(':'))
+            fire = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        except (ValueError, AttributeError, TypeError):
+            continue  # Skip broken times like "8am", 800 or null
 
-        print_feed(printer, 5)
-        printer.close()
+        if fire <= now or (last_fired and fire <= last_fired):
+            fire += datetime.timedelta(days=1)
 
-        return True, "Printed successfully"
+        upcoming.append(fire)
 
-    except Exception as e:
-        return False, str(e)
+    return min(upcoming) if upcoming else None
 
 
 # ------------------------------------------------
@@ -344,11 +226,22 @@ class CalendarPrinterGUI:
 
         self.config = load_config()
         self.scheduler_running = False
+        self.scheduler_loop = None   # asyncio loop of the scheduler thread
+        self.scheduler_task = None   # the running scheduler coroutine
+        self.scheduler_stop = None   # threading.Event, set when Stop is pressed
+        self.printer = None          # Serial connection, opened on first print
+        self.printer_lock = threading.Lock()  # One print at a time
         self.tasks_cache = []
 
         self.create_widgets()
         self.load_tasks()
 
+        if self.config.get('auto_start'):
+            self.start_scheduler()
+
+        # Release the COM port when the program closes
+        atexit.register(self.close_printer)
+
     # ---------------- GUI LAYOUT ----------------
 
     def create_widgets(self):
@@ -389,6 +282,13 @@ class CalendarPrinterGUI:
             command=self.print_now_clicked
         ).pack(pady=20)
 
+        self.scheduler_button = ttk.Button(
+            tab,
+            text="▶️ Start Scheduler",
+            command=self.toggle_scheduler
+        )
+        self.scheduler_button.pack(pady=5)
+
         self.log_text = scrolledtext.ScrolledText(tab, height=15)
         self.log_text.pack(fill='both', expand=True, padx=20)
 
@@ -435,7 +335,15 @@ class CalendarPrinterGUI:
 
     def log(self, text):
         """
-        Writes message to log box
+        Writes message to log box.
+        Safe to call from background threads: Tkinter may only be
+        touched from the main thread, so the write is handed to it.
+        """
+        self.root.after(0, self._write_log, text)
+
+    def _write_log(self, text):
+        """
+        Does the actual write for log() (main thread only)
         """
         self.log_text.insert(tk.END, text + "\n")
         self.log_text.see(tk.END)
@@ -444,7 +352,7 @@ class CalendarPrinterGUI:
         """
         Loads tasks into GUI
         """
-        self.tasks_cache = get_todays_tasks()
+        self.tasks_cache = get_todays_tasks(authenticate_google())
 
     def print_now_clicked(self):
         """
@@ -456,18 +364,205 @@ class CalendarPrinterGUI:
         """
         Performs printing
         """
-        events = get_todays_events()
-        tasks = get_todays_tasks()
+        asyncio.run(self.do_print_async())
 
-        success, msg = print_schedule(
-            self.config,
+    async def do_print_async(self):
+        """
+        Downloads everything and prints it (used by button and scheduler)
+        """
+        events, tasks = await fetch_all()
+
+        success, msg = await asyncio.to_thread(
+            self.send_to_printer,
             events,
-            tasks,
-            self.config.get('task_priorities', {})
+            tasks
         )
 
         self.log(msg)
 
+    # ---------------- PRINTER CONNECTION ----------------
+
+    def _get_printer(self):
+        """
+        Returns the open printer connection.
+        Connecting over Bluetooth is slow, so we only do it
+        when there is no open connection yet.
+        """
+        if self.printer is None or not self.printer.is_open:
+            self.printer = connect_to_printer(
+                self.config['printer_port'],
+                self.config['printer_baudrate']
+            )
+
+        return self.printer
+
+    def close_printer(self):
+        """
+        Closes the printer connection (if it is open)
+        """
+        if self.printer:
+            try:
+                self.printer.close()
+            except Exception:
+                pass
+            self.printer = None
+
+    def send_to_printer(self, events, tasks):
+        """
+        Prints using the shared connection (runs in a worker thread)
+        """
+        with self.printer_lock:
+            try:
+                printer = self._get_printer()
+            except Exception as e:
+                return False, str(e)
+
+            success, msg = print_schedule(
+                printer,
+                events,
+                tasks,
+                self.config.get('task_priorities', {})
+            )
+
+            # Connection is probably broken, open a new one next time
+            if not success:
+                self.close_printer()
+
+            return success, msg
+
+    # ---------------- SCHEDULER ----------------
+
+    def toggle_scheduler(self):
+        """
+        Start/Stop button
+        """
+        if self.scheduler_running:
+            self.stop_scheduler()
+        else:
+            self.start_scheduler()
+
+    def start_scheduler(self):
+        """
+        Starts automatic printing in a background thread
+        """
+        if self.scheduler_running:
+            return
+
+        self.scheduler_running = True
+
+        # Every run gets its own stop flag, so an old run that is
+        # still finishing can't be mixed up with the new one
+        self.scheduler_stop = threading.Event()
+
+        threading.Thread(
+            target=self.run_scheduler,
+            args=(self.scheduler_stop,),
+            daemon=True
+        ).start()
+        self.update_scheduler_status()
+
+    def stop_scheduler(self):
+        """
+        Stops automatic printing
+        """
+        self.scheduler_running = False
+        self.scheduler_stop.set()
+
+        # Wake up the sleeping scheduler so it ends right now
+        # (if it hasn't started yet, it sees scheduler_stop instead)
+        if self.scheduler_loop and self.scheduler_task:
+            try:
+                self.scheduler_loop.call_soon_threadsafe(self.scheduler_task.cancel)
+            except RuntimeError:
+                pass  # Loop already finished
+
+        self.update_scheduler_status()
+        self.log("Scheduler stopped")
+
+    def update_scheduler_status(self):
+        """
+        Shows if the scheduler is running on the button and status bar
+        """
+        if self.scheduler_running:
+            self.scheduler_button.config(text="⏹️ Stop Scheduler")
+            self.status_label.config(text="Scheduler: Running ✓")
+        else:
+            self.scheduler_button.config(text="▶️ Start Scheduler")
+            self.status_label.config(text="Ready")
+
+    def run_scheduler(self, stop_event):
+        """
+        Runs in the background thread.
+        Gives the scheduler its own asyncio event loop.
+        """
+        try:
+            asyncio.run(self.scheduler_main(stop_event))
+        except asyncio.CancelledError:
+            pass  # Stop button was pressed
+
+    async def scheduler_main(self, stop_event):
+        """
+        Sleeps until the next print time, prints, and repeats.
+
+        We sleep in steps of at most SCHEDULER_STEP_SECONDS and look
+        at the clock again after each one, so clock changes (summer
+        time, the PC waking up from sleep) don't make us print at
+        the wrong time.
+        """
+        task = asyncio.current_task()
+        self.scheduler_loop = asyncio.get_running_loop()
+        self.scheduler_task = task
+
+        last_fired = None
+
+        try:
+            while not stop_event.is_set():
+                next_time = next_print_time(
+                    self.config['schedules'],
+                    last_fired=last_fired
+                )
+
+                if next_time is None:
+                    self.log("No valid print times, scheduler stopped")
+                    stop_event.set()
+                    self.scheduler_running = False
+                    self.root.after(0, self.update_scheduler_status)
+                    return
+
+                self.log(f"Next print at {next_time.strftime('%H:%M')}")
+
+                while not stop_event.is_set():
+                    wait = (next_time - datetime.datetime.now()).total_seconds()
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(min(wait, SCHEDULER_STEP_SECONDS))
+
+                # Stop was pressed while we were sleeping
+                if stop_event.is_set():
+                    return
+
+                last_fired = next_time
+
+                try:
+                    await self.do_print_async()
+                except Exception as e:
+                    self.log(f"Scheduled print failed: {e}")
+
+        except Exception as e:
+            # Something unexpected went wrong: say so and show
+            # the scheduler as stopped instead of dying silently
+            self.log(f"Scheduler crashed: {e}")
+            if not stop_event.is_set():
+                stop_event.set()
+                self.scheduler_running = False
+                self.root.after(0, self.update_scheduler_status)
+
+        finally:
+            # Only forget the loop if a newer run hasn't replaced it
+            if self.scheduler_task is task:
+                self.scheduler_loop = None
+                self.scheduler_task = None
+
 
 # ------------------------------------------------
 # MAIN ENTRY POINT
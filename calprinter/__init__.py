@@ -0,0 +1,6 @@
+"""
+Calendar Printer shared package.
+
+The runnable scripts live in the project folder;
+the code they all share is in calprinter.core.
+"""
@@ -0,0 +1,497 @@
+"""
+Shared code for all Calendar Printer scripts.
+
+The basic printer, the Calendar + Tasks printer and the GUI
+all used to have their own copy of these functions.
+Now they live here once, so a fix only has to be made in one place.
+
+What's in here:
+- Google login (done once per run)
+- Fetching today's events and tasks (in parallel, with a short cache)
+- Printer connection and print buffer helpers
+- Formatting events and tasks as text
+"""
+
+# ------------------------------------------------
+# IMPORTS
+# ------------------------------------------------
+
+import os                 # Used for file and folder paths
+import datetime           # Used for dates and time
+import functools          # Used to remember formatted times
+import asyncio            # Used to download from Google in parallel
+import pickle             # Used to keep downloaded data between prints
+import threading          # Used so two downloads don't share a connection at once
+import time               # Used to measure how old the cache is
+import serial             # Used to talk to thermal printer
+import requests           # Used to keep the login connection open
+
+# Google API imports
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+
+
+# ------------------------------------------------
+# BASIC CONFIGURATION
+# ------------------------------------------------
+
+# Google permissions (used unless a script passes its own)
+# Calendar = events
+# Tasks = to-do list
+SCOPES = [
+    'https://www.googleapis.com/auth/calendar.readonly',
+    'https://www.googleapis.com/auth/tasks.readonly'
+]
+
+# Things we only create ONCE per run
+_CREDS = None                          # Logged-in Google credentials
+_SESSION = requests.Session()          # Keeps the login server connection open
+_AUTH_REQ = Request(session=_SESSION)  # Reused for every token refresh
+_SERVICES = {}                         # Google API services, e.g. {'calendar': (creds, service)}
+
+# A Google API service has one http connection, which is not safe to use
+# from two threads at once (e.g. "Print Now" while a scheduled print runs).
+# So only one download per API runs at a time.
+_CALENDAR_LOCK = threading.Lock()
+_TASKS_LOCK = threading.Lock()
+
+# Only one login at a time, so two prints at once never refresh the
+# token together, write token.json together or open two browsers
+_LOGIN_LOCK = threading.Lock()
+
+# Folder where downloaded events/tasks are kept for a short time,
+# so printing twice in a row doesn't ask Google again
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'adhd_printer')
+CACHE_TTL_SECONDS = 60
+
+
+# ------------------------------------------------
+# GOOGLE AUTHENTICATION
+# ------------------------------------------------
+
+def authenticate_google(scopes=SCOPES):
+    """
+    Logs into Google (Calendar + Tasks).
+
+    scopes are the Google permissions to ask for. A script that only
+    needs the calendar passes its own list, so an older token.json
+    that only allows the calendar keeps working.
+
+    First time:
+    - Browser opens
+    - You login
+    - token.json is created
+
+    Next time:
+    - token.json is reused
+    - Inside one run, the login is only done once
+    """
+    with _LOGIN_LOCK:
+        return _login(scopes)
+
+
+def _login(scopes):
+    """
+    Does the actual login for authenticate_google()
+    """
+
+    global _CREDS
+
+    # Already logged in during this run
+    if _CREDS and _CREDS.valid:
+        return _CREDS
+
+    creds = _CREDS
+
+    # Load token if it exists
+    if not creds:
+        try:
+            creds = Credentials.from_authorized_user_file('token.json', scopes)
+        except FileNotFoundError:
+            creds = None
+
+    # If token missing or invalid
+    if not creds or not creds.valid:
+
+        # Refresh expired token
+        if creds and creds.expired and creds.refresh_token:
+            print("Refreshing Google access token...")
+            creds.refresh(_AUTH_REQ)
+
+        # First time login
+        else:
+            print("Opening browser for Google login...")
+            if 'https://www.googleapis.com/auth/tasks.readonly' in scopes:
+                print("Please approve BOTH Calendar and Tasks access")
+
+            flow = InstalledAppFlow.from_client_secrets_file(
+                'credentials.json',
+                scopes
+            )
+            creds = flow.run_local_server(port=0)
+
+        # Save token
+        with open('token.json', 'w') as token:
+            token.write(creds.to_json())
+
+    _CREDS = creds
+    return creds
+
+
+def get_service(api_name, version, creds):
+    """
+    Builds a Google API service once and reuses it afterwards.
+    If different credentials are passed in, the service is built again.
+    """
+    cached = _SERVICES.get(api_name)
+
+    if cached is None or cached[0] is not creds:
+        service = build(
+            api_name,
+            version,
+            credentials=creds,
+            # Use the API description that ships with the library
+            # instead of downloading it from Google every time
+            static_discovery=True,
+            cache_discovery=True
+        )
+        _SERVICES[api_name] = (creds, service)
+
+    return _SERVICES[api_name][1]
+
+
+# ------------------------------------------------
+# LOCAL CACHE
+# ------------------------------------------------
+
+def _cache_get(key, ttl_seconds):
+    """
+    Returns the data saved under key,
+    or None if it is missing or older than ttl_seconds
+    """
+    path = os.path.join(CACHE_DIR, f'{key}.pkl')
+
+    try:
+        with open(path, 'rb') as f:
+            saved_at, payload = pickle.load(f)
+        age = time.time() - saved_at
+    except Exception:
+        return None  # Missing, broken, or saved by an older version
+
+    # A negative age means the clock went back (summer time, clock fix),
+    # so we can't tell how old it really is
+    if age < 0 or age > ttl_seconds:
+        return None
+
+    return payload
+
+
+def _cache_put(key, value):
+    """
+    Saves value under key together with the current time
+    (seconds since 1970, which doesn't jump when summer time changes)
+    """
+    path = os.path.join(CACHE_DIR, f'{key}.pkl')
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump((time.time(), value), f)
+    except OSError as e:
+        print("Could not save cache:", e)
+
+
+# ------------------------------------------------
+# FETCH GOOGLE CALENDAR EVENTS
+# ------------------------------------------------
+
+def get_todays_events(creds):
+    """
+    Fetches today's calendar events.
+    creds comes from authenticate_google()
+    """
+    with _CALENDAR_LOCK:
+        return _download_events(creds)
+
+
+def _download_events(creds):
+    """
+    Does the actual download for get_todays_events()
+    """
+
+    now = datetime.datetime.now()
+
+    # Reuse a recent download if we have one
+    # (the date is in the name, so after midnight we never get yesterday's)
+    cache_key = f'events_{now.date()}'
+    events = _cache_get(cache_key, CACHE_TTL_SECONDS)
+    if events is not None:
+        return events
+
+    service = get_service('calendar', 'v3', creds)
+
+    start_day = datetime.datetime.combine(now.date(), datetime.time.min)
+    end_day = datetime.datetime.combine(now.date(), datetime.time.max)
+
+    time_min = start_day.isoformat() + 'Z'
+    time_max = end_day.isoformat() + 'Z'
+
+    events_result = service.events().list(
+        calendarId='primary',
+        timeMin=time_min,
+        timeMax=time_max,
+        singleEvents=True,
+        orderBy='startTime',
+        # Only download the parts we actually print
+        fields='items(summary,start(dateTime,date))'
+    ).execute()
+
+    events = events_result.get('items', [])
+    _cache_put(cache_key, events)
+
+    return events
+
+
+async def get_todays_events_async(creds):
+    """
+    Fetches today's calendar events in a background thread
+    """
+    return await asyncio.to_thread(get_todays_events, creds)
+
+
+# ------------------------------------------------
+# FETCH GOOGLE TASKS
+# ------------------------------------------------
+
+def get_todays_tasks(creds):
+    """
+    Fetches incomplete Google Tasks.
+    creds comes from authenticate_google()
+    """
+    with _TASKS_LOCK:
+        return _download_tasks(creds)
+
+
+def _download_tasks(creds):
+    """
+    Does the actual download for get_todays_tasks()
+    """
+
+    service = get_service('tasks', 'v1', creds)
+
+    all_tasks = []
+    results = {}  # task list id -> tasks in that list
+
+    def save_tasks(request_id, response, exception):
+        """
+        Called once for every task list in the batch
+        """
+        if exception is not None:
+            print(f"Error loading list {request_id}:", exception)
+            return
+
+        results[request_id] = response.get('items', [])
+        _cache_put(f'tasks_{request_id}', results[request_id])
+
+    try:
+        lists = _cache_get('tasklists', CACHE_TTL_SECONDS)
+
+        if lists is None:
+            task_lists = service.tasklists().list(
+                fields='items(id,title)'
+            ).execute()
+            lists = task_lists.get('items', [])
+            _cache_put('tasklists', lists)
+
+        # One http call for all task lists we don't have yet
+        batch = service.new_batch_http_request(callback=save_tasks)
+
+        for task_list in lists:
+            cached = _cache_get(f"tasks_{task_list['id']}", CACHE_TTL_SECONDS)
+
+            if cached is not None:
+                results[task_list['id']] = cached
+                continue
+
+            batch.add(
+                service.tasks().list(
+                    tasklist=task_list['id'],
+                    showCompleted=False,
+                    showHidden=False,
+                    fields='items(id,title)'
+                ),
+                request_id=task_list['id']
+            )
+
+        batch.execute()
+
+        # Keep the same order as the task lists
+        # (only keep the fields we print, instead of the whole Google dict)
+        for task_list in lists:
+            all_tasks.extend(
+                {
+                    'list_name': task_list['title'],
+                    'title': task.get('title', 'Untitled Task'),
+                    'id': task.get('id', '')
+                }
+                for task in results.get(task_list['id'], [])
+            )
+
+    except Exception as e:
+        print("Error loading tasks:", e)
+
+    return all_tasks
+
+
+async def get_todays_tasks_async(creds):
+    """
+    Fetches incomplete Google Tasks in a background thread
+    """
+    return await asyncio.to_thread(get_todays_tasks, creds)
+
+
+async def fetch_all():
+    """
+    Fetches events and tasks at the same time.
+    Returns (events, tasks)
+    """
+
+    # Login once and share it, so both downloads use the same token
+    # (authenticate_google() also makes other threads wait their turn,
+    # so two browser windows never open together)
+    creds = authenticate_google()
+
+    events, tasks = await asyncio.gather(
+        get_todays_events_async(creds),
+        get_todays_tasks_async(creds)
+    )
+    return events, tasks
+
+
+# ------------------------------------------------
+# PRINTER HELPERS
+# ------------------------------------------------
+
+def connect_to_printer(port, baudrate):
+    """
+    Connects to the thermal printer
+    """
+    try:
+        printer = serial.Serial(
+            port=port,
+            baudrate=baudrate,
+            timeout=1,
+            write_timeout=5,   # Changed per page in write_page()
+            rtscts=False,
+            dsrdtr=False
+        )
+    except Exception as e:
+        raise Exception(f"Printer connection failed: {e}")
+
+    # Bigger send buffer so a whole page fits in at once
+    # (set_buffer_size only exists on Windows, and some Bluetooth
+    # drivers refuse it - printing still works without it)
+    if hasattr(printer, 'set_buffer_size'):
+        try:
+            printer.set_buffer_size(rx_size=4096, tx_size=16384)
+        except serial.SerialException:
+            pass
+
+    return printer
+
+
+# Printer bytes that never change, built once when the program starts
+_SEP_BYTES = b"-" * 32 + b"\n"
+_FEED_CACHE = {n: b"\n" * n for n in range(1, 8)}
+
+# Text is collected in a list "buffer" first, joined once and then
+# sent to the printer in one write (much faster than many small ones)
+
+def buf_text(buf, text):
+    """
+    Adds text to the print buffer
+    """
+    buf.append(text.encode('utf-8', errors='ignore'))
+
+
+def buf_line(buf):
+    """
+    Adds a separator line to the print buffer
+    """
+    buf.append(_SEP_BYTES)
+
+
+def buf_feed(buf, lines=3):
+    """
+    Adds paper feed to the print buffer
+    """
+    buf.append(_FEED_CACHE.get(lines) or b"\n" * lines)
+
+
+def write_page(printer, buf):
+    """
+    Sends the whole print buffer to the printer in one write.
+
+    The write timeout is based on the page size: each byte takes
+    10 bits on the wire, we allow twice that time plus 5 seconds.
+    So a long page still fits, but a stuck printer gives up.
+    """
+    data = b"".join(buf)
+
+    printer.write_timeout = 5 + 2 * len(data) * 10 / printer.baudrate
+    printer.write(data)
+    printer.flush()  # Wait until it has all been sent
+
+
+# ------------------------------------------------
+# FORMAT FUNCTIONS
+# ------------------------------------------------
+
+@functools.lru_cache(maxsize=1440)
+def _fmt_hm(hour, minute):
+    """
+    Formats a time like "01:05 PM" (cached, faster than strftime)
+    """
+    suffix = 'AM' if hour < 12 else 'PM'
+    return f"{hour % 12 or 12:02d}:{minute:02d} {suffix}"
+
+
+def format_event(event, all_day='All Day', untitled='Untitled Event'):
+    """
+    Formats calendar event text.
+    all_day and untitled are the words used for all-day events
+    and events without a title (each script has its own wording).
+    """
+    title = event.get('summary', untitled)
+    start = event['start'].get('dateTime', event['start'].get('date'))
+
+    if 'T' in start:
+        # Older Python versions can't read a "Z" at the end
+        if start[-1] == 'Z':
+            start = start[:-1] + '+00:00'
+        dt = datetime.datetime.fromisoformat(start)
+        time_str = _fmt_hm(dt.hour, dt.minute)
+    else:
+        time_str = all_day
+
+    return f"{time_str} - {title}\n"
+
+
+def format_task(task, priority='Normal'):
+    """
+    Formats task text.
+    High priority tasks get a "!!!" marker.
+    """
+    title = task.get('title', 'Untitled Task')
+    list_name = task.get('list_name', 'Tasks')
+
+    marker = '!!! ' if priority == 'High' else ''
+
+    text = f"[ ] {marker}{title}\n"
+
+    if list_name != 'My Tasks':
+        text += f"    List: {list_name}\n"
+
+    return text